@@ -90,10 +90,16 @@ class TextConfig:
 class PdfConfig:
     """Configuration for Universal PDF Processor."""
     DEFAULT_PAGE_SIZE = "A4"  # A4, LETTER, etc.
+    PAGE_SIZES = {
+        'A4': 'A4 (210 x 297 mm)',
+        'LETTER': 'Letter (8.5 x 11 in)',
+        'LEGAL': 'Legal (8.5 x 14 in)',
+    }
     FONT_HEADER = "Helvetica-Bold"
     FONT_BODY = "Courier"
     FONT_SIZE_HEADER = 12
     FONT_SIZE_BODY = 10
+    SHOW_PAGE_NUMBERS = False
     MARGIN = 40
 
 # ==================== LOGGING & OUTPUT ====================
@@ -3,8 +3,21 @@
 Core package - Contains main business logic modules
 """
 
+import importlib
+
 from .file_manager import FileManager
-from .image_processor import ImageProcessor
-from .text_processor import TextProcessor
+
+# Heavy modules (Pillow) are only imported when first accessed
+_LAZY = {
+    'ImageProcessor': '.image_processor',
+    'TextProcessor': '.text_processor',
+}
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = ['FileManager', 'ImageProcessor', 'TextProcessor']    
\ No newline at end of file
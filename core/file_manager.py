@@ -6,7 +6,7 @@ Handles file I/O with safety checks and decoupling from specific libraries.
 import os
 import shutil
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 from datetime import datetime
 import logging
 
@@ -126,13 +126,15 @@ class FileManager:
         return None, "Failed to decode file (unknown encoding)"
 
     @staticmethod
-    def copy_files_to_folder(files: List[str], dest: str, move: bool = False) -> Tuple[bool, Optional[str]]:
-        """Batch copy or move files to destination."""
+    def copy_files_to_folder(files: List[str], dest: str, move: bool = False,
+                             progress_cb: Optional[Callable[[str], None]] = None) -> Tuple[bool, Optional[str]]:
+        """Batch copy or move files to destination. progress_cb gets one message per file."""
         try:
             dest_path = Path(dest)
             dest_path.mkdir(parents=True, exist_ok=True)
             errors = []
-            for f in files:
+            for i, f in enumerate(files, 1):
+                if progress_cb: progress_cb(f"[{i}/{len(files)}] {Path(f).name}")
                 try:
                     src = Path(f)
                     if not src.exists():
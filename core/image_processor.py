@@ -4,15 +4,77 @@ Optimized for memory usage (stream processing) and detailed reporting.
 """
 
 from PIL import Image, ImageFilter, ImageDraw, ImageFont
-from typing import List, Tuple, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, List, Tuple, Optional
+import multiprocessing
 import logging
 import math
+import os
 
 from config import ImageConfig
 from core.file_manager import FileManager
 
 logger = logging.getLogger(__name__)
 
+# Below this many files the process pool costs more than it saves
+PARALLEL_MIN_FILES = 4
+
+def _layout_slots(slots: List[Tuple[int, int]], layout: str, spacing: int,
+                  grid_cols: Optional[int] = None) -> Tuple[int, int, List[Tuple[int, int]]]:
+    """
+    Canvas size and top-left origin of each slot, for slots of the given sizes.
+    Shared by the sequential and parallel merges so both place images identically.
+    """
+    if layout == 'horizontal':
+        origins, x = [], 0
+        for w, h in slots:
+            origins.append((x, 0))
+            x += w + spacing
+        return x - spacing, max(h for w, h in slots), origins
+    if layout == 'grid':
+        cols = grid_cols or math.ceil(math.sqrt(len(slots)))
+        origins, y, canvas_w = [], 0, 0
+        for r in range(0, len(slots), cols):
+            row = slots[r:r + cols]
+            x = 0
+            for w, h in row:
+                origins.append((x, y))
+                x += w + spacing
+            canvas_w = max(canvas_w, x - spacing)
+            y += max(h for w, h in row) + spacing
+        return canvas_w, y - spacing, origins
+    # vertical
+    origins, y = [], 0
+    for w, h in slots:
+        origins.append((0, y))
+        y += h + spacing
+    return max(w for w, h in slots), y - spacing, origins
+
+def _paste_position(layout: str, origin: Tuple[int, int], size: Tuple[int, int],
+                    canvas_size: Tuple[int, int]) -> Tuple[int, int]:
+    """Where an image goes in its slot: centered across the stacking axis, top-left in a grid."""
+    if layout == 'horizontal':
+        return origin[0], (canvas_size[1] - size[1]) // 2
+    if layout == 'grid':
+        return origin
+    return (canvas_size[0] - size[0]) // 2, origin[1]
+
+def _load_and_prepare(path: str, resize_mode: str,
+                      target_size: Optional[Tuple[int, int]],
+                      filter_name: str) -> Optional[Tuple[str, Tuple[int, int], bytes]]:
+    """
+    Worker-process step: decode, resize and filter one image.
+    Returns (mode, size, raw bytes) so the tile pickles cheaply, or None on failure.
+    """
+    try:
+        with Image.open(path) as img:
+            processed = ImageProcessor().prepare(img, resize_mode, target_size, filter_name)
+            return processed.mode, processed.size, processed.tobytes()
+    except Exception as e:
+        logger.error(f"Failed during processing of {path}: {e}")
+        return None
+
 class ImageProcessor:
     def __init__(self, config: Optional[ImageConfig] = None):
         # Use class reference to access static defaults or instance if provided
@@ -39,154 +101,149 @@ class ImageProcessor:
                          target_size: Optional[Tuple[int, int]] = None,
                          filter_name: Optional[str] = None,
                          watermark: Optional[str] = None,
-                         grid_cols: Optional[int] = None) -> Tuple[bool, str]:
+                         grid_cols: Optional[int] = None,
+                         progress_cb: Optional[Callable[[str], None]] = None) -> Tuple[bool, str]:
         """
         Merges images with memory safety and returns detailed statistics.
         Uses Config defaults if arguments are not provided.
+        progress_cb, if given, receives one message per file; raising from it aborts the merge.
+        """
+        resize_mode = resize_mode if resize_mode is not None else self.config.DEFAULT_RESIZE_MODE
+        filter_name = filter_name if filter_name is not None else self.config.DEFAULT_FILTER
+        return self._merge(files, output_path, layout, spacing, resize_mode, target_size, watermark, grid_cols,
+                           self._prepare_each(files, resize_mode, target_size, filter_name), progress_cb)
+
+    def process_and_merge_parallel(self, files: List[str], output_path: str,
+                                   layout: Optional[str] = None,
+                                   spacing: Optional[int] = None,
+                                   resize_mode: Optional[str] = None,
+                                   target_size: Optional[Tuple[int, int]] = None,
+                                   filter_name: Optional[str] = None,
+                                   watermark: Optional[str] = None,
+                                   grid_cols: Optional[int] = None,
+                                   max_workers: Optional[int] = None,
+                                   progress_cb: Optional[Callable[[str], None]] = None) -> Tuple[bool, str]:
+        """
+        Same result as process_and_merge, but resizes/filters the inputs in a
+        process pool. Only a window of 2 tiles per worker is in flight, so
+        memory stays at the canvas plus that window. The pool is only used when
+        there is per-image work to spread (a filter or a resize target);
+        otherwise, and for small batches, this is process_and_merge.
+        """
+        resize_mode = resize_mode if resize_mode is not None else self.config.DEFAULT_RESIZE_MODE
+        filter_name = filter_name if filter_name is not None else self.config.DEFAULT_FILTER
+        has_tile_work = filter_name != 'none' or (target_size and resize_mode != 'none')
+        cpus = os.cpu_count() or 1
+        max_workers = min(max_workers or cpus, cpus, len(files))
+        if not has_tile_work or max_workers < 2 or len(files) < PARALLEL_MIN_FILES:
+            return self.process_and_merge(files, output_path, layout=layout, spacing=spacing,
+                                          resize_mode=resize_mode, target_size=target_size,
+                                          filter_name=filter_name, watermark=watermark, grid_cols=grid_cols,
+                                          progress_cb=progress_cb)
+        return self._merge(files, output_path, layout, spacing, resize_mode, target_size, watermark, grid_cols,
+                           self._prepare_in_pool(files, resize_mode, target_size, filter_name, max_workers),
+                           progress_cb)
+
+    def prepare(self, img: Image.Image, resize_mode: str,
+                target_size: Optional[Tuple[int, int]], filter_name: str) -> Image.Image:
+        """Normalize mode, resize and filter one opened image (fully loaded on return)."""
+        # 1. Normalize Mode
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGB')
+        
+        # 2. Resize
+        processed = img
+        if target_size and resize_mode != 'none':
+            processed = self.resize_image(img, target_size, resize_mode)
+        
+        # 3. Filter
+        if filter_name != 'none':
+            processed = self.apply_filter(processed, filter_name)
+        processed.load()
+        return processed
+
+    def _prepare_each(self, files, resize_mode, target_size, filter_name):
+        """Yield each prepared image (None on failure), one file open at a time."""
+        for f in files:
+            try:
+                with Image.open(f) as img:
+                    processed = self.prepare(img, resize_mode, target_size, filter_name)
+            except Exception as e:
+                logger.error(f"Failed during processing of {f}: {e}")
+                processed = None
+            yield processed
+
+    @staticmethod
+    def _prepare_in_pool(files, resize_mode, target_size, filter_name, max_workers):
+        """Like _prepare_each, but prepared in worker processes, in order."""
+        # 'spawn' avoids forking a process that already runs GUI/worker threads
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 mp_context=multiprocessing.get_context('spawn')) as pool:
+            pending = deque()
+            try:
+                for f in files:
+                    pending.append(pool.submit(_load_and_prepare, f, resize_mode, target_size, filter_name))
+                    if len(pending) >= 2 * max_workers:
+                        tile = pending.popleft().result()
+                        yield Image.frombytes(*tile) if tile else None
+                while pending:
+                    tile = pending.popleft().result()
+                    yield Image.frombytes(*tile) if tile else None
+            finally:
+                for future in pending: # Merge aborted: drop what hasn't started
+                    future.cancel()
+
+    def _merge(self, files, output_path, layout, spacing, resize_mode, target_size, watermark, grid_cols,
+               prepared, progress_cb=None) -> Tuple[bool, str]:
+        """
+        Shared merge: reserve one slot per readable file (its size, or target_size
+        when resizing), then paste images from `prepared` (one per file, None on
+        failure) into their slots. A file that fails after the scan leaves its slot blank.
         """
         # --- RESOLVE DEFAULTS FROM CONFIG ---
         layout = layout if layout is not None else self.config.DEFAULT_LAYOUT
         spacing = spacing if spacing is not None else self.config.DEFAULT_SPACING
-        resize_mode = resize_mode if resize_mode is not None else self.config.DEFAULT_RESIZE_MODE
-        filter_name = filter_name if filter_name is not None else self.config.DEFAULT_FILTER
         
         # Watermark Resolution
-        should_watermark = False
-        watermark_text = ""
-        
-        if watermark:
-            should_watermark = True
-            watermark_text = watermark
-        elif self.config.ADD_WATERMARK:
-            should_watermark = True
-            watermark_text = self.config.WATERMARK_TEXT
+        watermark_text = watermark or (self.config.WATERMARK_TEXT if self.config.ADD_WATERMARK else None)
 
         try:
             if not files:
                 return False, "No files provided"
 
-            # --- PASS 1: Scan Dimensions ---
+            # --- PASS 1: Scan Dimensions (headers only) ---
             dims = []
-            valid_count = 0
-            
             for f in files:
                 try:
                     with Image.open(f) as img:
-                        w, h = img.size
                         # If resizing, use the target size for calculation
-                        if target_size and resize_mode != 'none':
-                            w, h = target_size
-                        dims.append((w, h))
-                        valid_count += 1
+                        dims.append(target_size if target_size and resize_mode != 'none' else img.size)
                 except Exception as e:
                     logger.warning(f"Skipping invalid image {f}: {e}")
                     dims.append(None)
 
-            if valid_count == 0:
+            slots = [d for d in dims if d is not None]
+            if not slots:
                 return False, "All images failed to load."
 
-            # --- Calculate Canvas Size ---
-            valid_dims = [d for d in dims if d is not None]
-            canvas_w, canvas_h = 0, 0
-            
-            if layout == 'vertical':
-                canvas_w = max(d[0] for d in valid_dims)
-                canvas_h = sum(d[1] for d in valid_dims) + spacing * (len(valid_dims) - 1)
-            
-            elif layout == 'horizontal':
-                canvas_w = sum(d[0] for d in valid_dims) + spacing * (len(valid_dims) - 1)
-                canvas_h = max(d[1] for d in valid_dims)
-            
-            elif layout == 'grid':
-                if not grid_cols:
-                    grid_cols = math.ceil(math.sqrt(len(valid_dims)))
-                
-                # Row-based calculation
-                rows = []
-                current_row_h = 0
-                current_row_w = 0
-                max_row_w = 0
-                
-                for i, (w, h) in enumerate(valid_dims):
-                    if i % grid_cols == 0 and i > 0:
-                        rows.append((current_row_w, current_row_h))
-                        max_row_w = max(max_row_w, current_row_w)
-                        current_row_h = 0
-                        current_row_w = 0
-                    
-                    current_row_w += w + spacing
-                    current_row_h = max(current_row_h, h)
-                
-                # Append last row
-                rows.append((current_row_w, current_row_h))
-                max_row_w = max(max_row_w, current_row_w)
-                
-                canvas_w = max_row_w - spacing
-                canvas_h = sum(r[1] for r in rows) + spacing * (len(rows) - 1)
+            canvas_w, canvas_h, origins = _layout_slots(slots, layout, spacing, grid_cols)
+            canvas = Image.new('RGB', (canvas_w, canvas_h), self.config.DEFAULT_BACKGROUND)
 
             # --- PASS 2: Process & Paste ---
-            # Create canvas (RGB)
-            bg_color = self.config.DEFAULT_BACKGROUND
-            canvas = Image.new('RGB', (canvas_w, canvas_h), bg_color)
-            
-            x, y = 0, 0
+            origins = iter(origins)
             processed_count = 0
-            
-            # Grid helpers
-            col_idx = 0
-            row_max_h = 0
-
-            for i, f in enumerate(files):
-                if dims[i] is None: continue # Skip previously identified invalid files
-                
+            for i, (f, dim, processed) in enumerate(zip(files, dims, prepared), 1):
+                if progress_cb: progress_cb(f"[{i}/{len(files)}] {os.path.basename(f)}")
+                if dim is None: continue # Skip previously identified invalid files
+                origin = next(origins)
+                if processed is None: continue
                 try:
-                    with Image.open(f) as img:
-                        # 1. Normalize Mode
-                        if img.mode not in ('RGB', 'RGBA'):
-                            img = img.convert('RGB')
-                        
-                        # 2. Resize
-                        processed = img
-                        if target_size and resize_mode != 'none':
-                            processed = self.resize_image(img, target_size, resize_mode)
-                        
-                        # 3. Filter
-                        if filter_name != 'none':
-                            processed = self.apply_filter(processed, filter_name)
-                        
-                        # 4. Watermark
-                        if should_watermark:
-                            processed = self.add_watermark(processed, watermark_text)
-
-                        # 5. Paste
-                        if layout == 'vertical':
-                            paste_x = (canvas_w - processed.width) // 2
-                            canvas.paste(processed, (paste_x, y))
-                            y += processed.height + spacing
-                            
-                        elif layout == 'horizontal':
-                            paste_y = (canvas_h - processed.height) // 2
-                            canvas.paste(processed, (x, paste_y))
-                            x += processed.width + spacing
-                            
-                        elif layout == 'grid':
-                            canvas.paste(processed, (x, y))
-                            
-                            x += processed.width + spacing
-                            row_max_h = max(row_max_h, processed.height)
-                            col_idx += 1
-                            
-                            if col_idx >= grid_cols:
-                                col_idx = 0
-                                x = 0
-                                y += row_max_h + spacing
-                                row_max_h = 0
-                        
-                        processed_count += 1
-                        
+                    if watermark_text:
+                        processed = self.add_watermark(processed, watermark_text)
+                    canvas.paste(processed, _paste_position(layout, origin, processed.size, (canvas_w, canvas_h)))
+                    processed_count += 1
                 except Exception as e:
                     logger.error(f"Failed during processing of {f}: {e}")
-                    continue
 
             # Save final result
             canvas.save(output_path, quality=self.config.DEFAULT_QUALITY)
@@ -200,6 +257,8 @@ class ImageProcessor:
         except Exception as e:
             logger.error(f"Fatal image processing error: {e}", exc_info=True)
             return False, str(e)
+        finally:
+            prepared.close()
 
     def resize_image(self, image: Image.Image, target_size: Tuple[int, int], mode: str) -> Image.Image:
         """Helper to resize a single image based on mode."""
@@ -10,7 +10,7 @@ from typing import Any
 from dataclasses import dataclass, asdict, field
 from datetime import datetime
 
-from config import BASE_DIR, ImageConfig, TextConfig, OutputConfig
+from config import BASE_DIR, ImageConfig, TextConfig, PdfConfig, OutputConfig
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +37,12 @@ class UserSettings:
     text_strip_whitespace: bool = False
     text_markdown_export: bool = False
     
+    # PDF / Universal
+    pdf_page_size: str = 'A4'
+    pdf_font: str = 'Helvetica'
+    pdf_font_size: int = 10
+    pdf_show_page_numbers: bool = True
+    
     # Output
     output_use_timestamp: bool = True
     output_auto_overwrite: bool = False
@@ -54,15 +60,21 @@ class UserSettings:
     advanced_backup_count: int = 5
     advanced_auto_cleanup: bool = True
     
+    # UI State
+    ui_last_open_dir: str = ''
+    
     # Meta
     last_modified: str = field(default_factory=lambda: datetime.now().isoformat())
     version: str = '2.2.1'
 
 class SettingsManager:
     SETTINGS_FILE = BASE_DIR / 'settings.json'
+    # UI state and meta fields never reach the config classes
+    UNAPPLIED_FIELDS = frozenset({'ui_last_open_dir', 'last_modified', 'version'})
     
     def __init__(self):
         self.settings = self.load_settings()
+        self._applied_fingerprint = None
     
     def load_settings(self) -> UserSettings:
         """Load settings from JSON or return defaults on failure."""
@@ -112,6 +124,23 @@ class SettingsManager:
         else:
             logger.warning(f"Attempted to set unknown setting: {key}")
 
+    def set_many(self, values: dict):
+        """Update several settings in one pass; unknown keys are skipped."""
+        known = self.settings.__dict__
+        unknown = values.keys() - known.keys()
+        if unknown:
+            logger.warning(f"Attempted to set unknown settings: {sorted(unknown)}")
+            values = {k: v for k, v in values.items() if k not in unknown}
+        known.update(values)
+
+    def _fingerprint(self) -> int:
+        return hash(tuple(sorted((k, v) for k, v in self.settings.__dict__.items()
+                                 if k not in self.UNAPPLIED_FIELDS)))
+
+    def settings_dirty(self) -> bool:
+        """True if settings changed since the last apply_to_config()."""
+        return self._fingerprint() != self._applied_fingerprint
+
     def apply_to_config(self):
         """
         Propagate user settings to global Config classes.
@@ -135,6 +164,12 @@ class SettingsManager:
         TextConfig.STRIP_WHITESPACE = self.settings.text_strip_whitespace
         TextConfig.MARKDOWN_EXPORT = self.settings.text_markdown_export
         
+        # PDF / Universal
+        PdfConfig.DEFAULT_PAGE_SIZE = self.settings.pdf_page_size
+        PdfConfig.FONT_BODY = self.settings.pdf_font
+        PdfConfig.FONT_SIZE_BODY = self.settings.pdf_font_size
+        PdfConfig.SHOW_PAGE_NUMBERS = self.settings.pdf_show_page_numbers
+        
         # Output
         OutputConfig.USE_TIMESTAMP = self.settings.output_use_timestamp
         OutputConfig.AUTO_OVERWRITE = self.settings.output_auto_overwrite
@@ -142,6 +177,8 @@ class SettingsManager:
         OutputConfig.DEFAULT_DIRECTORY = self.settings.output_default_directory
         
         logger.info("User settings applied to runtime configuration.")
+        # Recorded only once every write above has succeeded
+        self._applied_fingerprint = self._fingerprint()
 
 # Singleton pattern
 _manager_instance = None
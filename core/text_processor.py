@@ -3,7 +3,7 @@ Text Processor Module
 Includes robust CSV/JSON handling and safer merging logic.
 """
 
-from typing import List, Tuple, Optional, Dict
+from typing import Callable, List, Tuple, Optional, Dict
 from pathlib import Path
 from datetime import datetime
 import logging
@@ -25,8 +25,9 @@ class TextProcessor:
                         separator_style: Optional[str] = None,
                         add_line_numbers: Optional[bool] = None,
                         add_timestamps: Optional[bool] = None,
-                        strip_whitespace: Optional[bool] = None) -> Tuple[bool, Optional[str]]:
-        """Merge text files by streaming content to output."""
+                        strip_whitespace: Optional[bool] = None,
+                        progress_cb: Optional[Callable[[str], None]] = None) -> Tuple[bool, Optional[str]]:
+        """Merge text files by streaming content to output. progress_cb gets one message per file."""
         
         # --- RESOLVE DEFAULTS FROM CONFIG ---
         separator_style = separator_style if separator_style is not None else self.config.DEFAULT_SEPARATOR
@@ -39,10 +40,11 @@ class TextProcessor:
             if self.config.MARKDOWN_EXPORT and output_path.endswith('.txt'):
                 # Auto-switch to markdown mode
                 output_path = output_path.replace('.txt', '.md')
-                return self.convert_to_markdown(filepaths, output_path)
+                return self.convert_to_markdown(filepaths, output_path, progress_cb=progress_cb)
 
             with open(output_path, 'w', encoding='utf-8') as out_f:
-                for fpath in filepaths:
+                for i, fpath in enumerate(filepaths, 1):
+                    if progress_cb: progress_cb(f"[{i}/{len(filepaths)}] {Path(fpath).name}")
                     content, err = self.file_manager.read_file_safe(fpath)
                     if content is None:
                         logger.warning(f"Skipping {fpath}: {err}")
@@ -73,13 +75,15 @@ class TextProcessor:
         except Exception as e:
             return False, str(e)
 
-    def convert_to_markdown(self, filepaths: List[str], output_path: str) -> Tuple[bool, Optional[str]]:
+    def convert_to_markdown(self, filepaths: List[str], output_path: str,
+                            progress_cb: Optional[Callable[[str], None]] = None) -> Tuple[bool, Optional[str]]:
         """Convert files to a single Markdown document with code blocks."""
         try:
             with open(output_path, 'w', encoding='utf-8') as out_f:
                 out_f.write(f"# Merged Document\nGenerated: {datetime.now()}\n\n")
                 
-                for fpath in filepaths:
+                for i, fpath in enumerate(filepaths, 1):
+                    if progress_cb: progress_cb(f"[{i}/{len(filepaths)}] {Path(fpath).name}")
                     content, err = self.file_manager.read_file_safe(fpath)
                     if not content: continue
                     
@@ -7,11 +7,11 @@ import os
 import io
 import logging
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Callable, List, Tuple, Optional
 
 # PDF Libraries
 from reportlab.pdfgen import canvas
-from reportlab.lib.pagesizes import A4
+from reportlab.lib.pagesizes import A4, LETTER, LEGAL
 from reportlab.lib.utils import ImageReader
 from pypdf import PdfWriter, PdfReader
 
@@ -28,13 +28,17 @@ from core.file_manager import FileManager
 
 logger = logging.getLogger(__name__)
 
+# PdfConfig.DEFAULT_PAGE_SIZE -> reportlab page size (points)
+_PAGE_SIZES = {'A4': A4, 'LETTER': LETTER, 'LEGAL': LEGAL}
+
 class UniversalProcessor:
     def __init__(self):
         self.file_manager = FileManager()
-        # Cache common page size
-        self.page_width, self.page_height = A4
+        # Page size for generated pages, re-read from PdfConfig on every merge
+        self.page_size = A4
 
-    def merge_all_to_pdf(self, filepaths: List[str], output_path: str) -> Tuple[bool, Optional[str]]:
+    def merge_all_to_pdf(self, filepaths: List[str], output_path: str,
+                         progress_cb: Optional[Callable[[str], None]] = None) -> Tuple[bool, Optional[str]]:
         """
         Universal Merging Strategy:
         - PDF: Append pages directly.
@@ -42,14 +46,17 @@ class UniversalProcessor:
         - Text/Web/Code: Read text and render nicely onto PDF page.
         - Office (Excel): Parse data and render as text/table on PDF page.
         - Binary/Archive: Generate a "File Info" placeholder card page.
+        progress_cb, if given, receives one message per file.
         """
         try:
             writer = PdfWriter()
             success_count = 0
+            self.page_size = _PAGE_SIZES.get(PdfConfig.DEFAULT_PAGE_SIZE, A4)
             
-            for fpath in filepaths:
+            for i, fpath in enumerate(filepaths, 1):
                 category = get_file_category(fpath)
                 logger.info(f"Processing {Path(fpath).name} as {category}")
+                if progress_cb: progress_cb(f"[{i}/{len(filepaths)}] {Path(fpath).name}")
 
                 try:
                     if category == 'document' and fpath.lower().endswith('.pdf'):
@@ -71,6 +78,9 @@ class UniversalProcessor:
                     logger.error(f"Failed to process item {fpath}: {item_error}")
                     self._create_error_page(writer, fpath, str(item_error))
 
+            if PdfConfig.SHOW_PAGE_NUMBERS:
+                self._add_page_numbers(writer)
+
             # Write final output
             with open(output_path, "wb") as out_f:
                 writer.write(out_f)
@@ -81,6 +91,19 @@ class UniversalProcessor:
             logger.error(f"Universal merge failed: {e}", exc_info=True)
             return False, str(e)
 
+    def _add_page_numbers(self, writer: PdfWriter):
+        """Stamp 'n / total' at the bottom center of every page."""
+        total = len(writer.pages)
+        for i, page in enumerate(writer.pages, 1):
+            w, h = float(page.mediabox.width), float(page.mediabox.height)
+            packet = io.BytesIO()
+            c = canvas.Canvas(packet, pagesize=(w, h))
+            c.setFont("Helvetica", 8)
+            c.drawCentredString(w / 2, 15, f"{i} / {total}")
+            c.save()
+            packet.seek(0)
+            page.merge_page(PdfReader(packet).pages[0])
+
     def _append_pdf(self, writer: PdfWriter, filepath: str):
         """Append pages from an existing PDF."""
         reader = PdfReader(filepath)
@@ -107,9 +130,9 @@ class UniversalProcessor:
         if not content: return
 
         packet = io.BytesIO()
-        c = canvas.Canvas(packet, pagesize=A4)
+        c = canvas.Canvas(packet, pagesize=self.page_size)
         margin = PdfConfig.MARGIN
-        width, height = A4
+        width, height = self.page_size
         
         # Header
         c.setFont(PdfConfig.FONT_HEADER, PdfConfig.FONT_SIZE_HEADER)
@@ -123,12 +146,14 @@ class UniversalProcessor:
         text_obj.setFont(PdfConfig.FONT_BODY, PdfConfig.FONT_SIZE_BODY)
         
         lines = content.split('\n')
-        max_lines = 55 # Approx lines per page
+        # Approx lines/chars per page: 55 x 90 on A4 at 10pt, scaled to page and font size
+        scale = 10 / PdfConfig.FONT_SIZE_BODY
+        max_lines = max(1, int(55 * height / A4[1] * scale))
+        chars_per_line = max(1, int(90 * width / A4[0] * scale))
         current_line_count = 0
         
         for line in lines:
             safe_line = line.replace('\r', '').replace('\t', '    ')
-            chars_per_line = 90
             chunks = [safe_line[i:i+chars_per_line] for i in range(0, len(safe_line), chars_per_line)] or [""]
             
             for chunk in chunks:
@@ -166,9 +191,9 @@ class UniversalProcessor:
             try:
                 wb = openpyxl.load_workbook(filepath, data_only=True)
                 packet = io.BytesIO()
-                c = canvas.Canvas(packet, pagesize=A4)
+                c = canvas.Canvas(packet, pagesize=self.page_size)
                 margin = PdfConfig.MARGIN
-                height = A4[1]
+                height = self.page_size[1]
                 y = height - margin
                 
                 for sheet in wb.sheetnames:
@@ -208,8 +233,8 @@ class UniversalProcessor:
     def _binary_to_pdf_pages(self, writer: PdfWriter, filepath: str):
         """Create placeholder card for binaries."""
         packet = io.BytesIO()
-        c = canvas.Canvas(packet, pagesize=A4)
-        w, h = A4
+        c = canvas.Canvas(packet, pagesize=self.page_size)
+        w, h = self.page_size
         
         c.setFillColorRGB(0.95, 0.95, 0.95)
         c.rect(50, h - 300, w - 100, 200, fill=1)
@@ -235,8 +260,8 @@ class UniversalProcessor:
 
     def _create_error_page(self, writer: PdfWriter, filepath: str, error: str):
         packet = io.BytesIO()
-        c = canvas.Canvas(packet, pagesize=A4)
-        w, h = A4
+        c = canvas.Canvas(packet, pagesize=self.page_size)
+        w, h = self.page_size
         
         c.setFont("Helvetica-Bold", 14)
         c.setFillColorRGB(0.8, 0, 0)
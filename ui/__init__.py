@@ -3,6 +3,16 @@
 UI package - Contains user interface modules
 """
 
-from .cli import CLI
+import importlib
+
+# CLI imports every processor; load it only when first accessed
+_LAZY = {'CLI': '.cli'}
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = ['CLI']
\ No newline at end of file
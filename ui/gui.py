@@ -5,46 +5,103 @@ Includes List Management (Reorder, Delete Single) and Universal Merging.
 
 import os
 import sys
+import inspect
+import queue
 import subprocess
 import threading
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, filedialog, messagebox, Toplevel, StringVar
 
 # Core components
 from core.settings_manager import get_settings_manager
-from config import get_output_path, OUTPUT_DIR
+from config import get_output_path, OUTPUT_DIR, SUPPORTED_IMAGE_FORMATS, SUPPORTED_TEXT_FORMATS, ImageConfig, TextConfig
 from core.file_manager import FileManager
-from core.image_processor import ImageProcessor
-from core.text_processor import TextProcessor
-from core.universal_processor import UniversalProcessor
-from ui.gui_settings import SettingsWindow
-
-# Colors
-COLOR_BG = "#F2F2F2"
-COLOR_FG = "#1A1A1A"
-COLOR_ACCENT_1 = "#D22730" 
-COLOR_ACCENT_2 = "#1F3A93"
-COLOR_PANEL = "#FFFFFF"
+from ui.theme import COLOR_BG, COLOR_FG, COLOR_ACCENT_1, COLOR_ACCENT_2, COLOR_PANEL
+# Processors and the settings window are imported on first use (Pillow,
+# reportlab and pypdf dominate startup otherwise)
+
+# Dialog choices (fixed at runtime)
+_LAYOUT_OPTS = (ImageConfig.LAYOUT_VERTICAL, ImageConfig.LAYOUT_HORIZONTAL, ImageConfig.LAYOUT_GRID)
+_RESIZE_OPTS = tuple(ImageConfig.RESIZE_MODES)
+_FILTER_OPTS = tuple(ImageConfig.FILTERS)
+_SEP_OPTS = tuple(TextConfig.SEPARATOR_STYLES)
+
+# Batch folder filters (immutable, shared across scans)
+_IMAGE_EXTS = frozenset(SUPPORTED_IMAGE_FORMATS)
+_TEXT_EXTS = frozenset(SUPPORTED_TEXT_FORMATS)
+
+_HELP_MESSAGE = "Gunakan panel samping untuk navigasi."
 
 class GUIApp:
+    LOG_POLL_MS = 100 # Log queue drain interval
+    LOG_BATCH = 200   # Max log lines written per drain
+    LOG_MAX_LINES = 5000 # Older log lines are dropped beyond this
+
     def __init__(self):
         self.settings_mgr = get_settings_manager()
         self.file_manager = FileManager()
-        self.image_processor = ImageProcessor()
-        self.text_processor = TextProcessor()
-        self.universal_processor = UniversalProcessor()
+        # Processors are created on first use (see properties below)
+        self._image_processor = None
+        self._text_processor = None
+        self._universal_processor = None
         
         self.files = [] # List of file paths
+        self._files_set = set() # Distinct paths in self.files, for O(1) membership
+        self._dialogs = {} # Cached option dialogs (see _dialog)
+        self._info_cache = {} # path -> (mtime, size, get_file_info() result + preformatted row values)
+        self._iids = [] # Treeview item ids, aligned with self.files
+        self._refresh_pending = False # See _schedule_refresh
+        self._pending_select = None
+        self._last_dir = self.settings_mgr.get_setting('ui_last_open_dir') or None
+        self._last_dir_changed = False # Persisted once, on close
+        # category -> merge options dialog
+        self._merge_handlers = {
+            'image': self.show_image_options,
+            'text': self.show_text_options,
+            'mixed': self.show_universal_options,
+            'document': self.show_universal_options,
+        }
         self.root = tk.Tk()
         self.root.title("File Merger Pro")
         self.root.geometry("1000x700")
         
+        self._log_queue = queue.SimpleQueue()
+        self._closing = False
+        self._pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='GUIWorker')
+        self._futures = set() # Jobs not finished yet, cancelled on close
+        
         self._setup_bauhaus_style()
         self._build_ui()
+        self.root.after(self.LOG_POLL_MS, self._drain_log_queue)
+        self.root.protocol("WM_DELETE_WINDOW", self._on_close)
+
+    @property
+    def image_processor(self):
+        if self._image_processor is None:
+            from core.image_processor import ImageProcessor
+            self._image_processor = ImageProcessor()
+        return self._image_processor
+
+    @property
+    def text_processor(self):
+        if self._text_processor is None:
+            from core.text_processor import TextProcessor
+            self._text_processor = TextProcessor()
+        return self._text_processor
+
+    @property
+    def universal_processor(self):
+        if self._universal_processor is None:
+            from core.universal_processor import UniversalProcessor
+            self._universal_processor = UniversalProcessor()
+        return self._universal_processor
 
     def _setup_bauhaus_style(self):
         self.style = ttk.Style(self.root)
-        self.style.theme_use('clam')
+        # Themes are per Tk interpreter, so check the live theme rather than a process-wide flag
+        if self.style.theme_use() != 'clam':
+            self.style.theme_use('clam')
         
         self.style.configure(".", background=COLOR_BG, foreground=COLOR_FG, font=("Helvetica", 10))
         self.style.configure("TFrame", background=COLOR_BG)
@@ -73,19 +130,25 @@ class GUIApp:
         
         tk.Label(sidebar, text="FILE\nMERGER\nPRO", bg=COLOR_FG, fg="white", font=("Helvetica", 24, "bold"), justify=tk.LEFT).pack(anchor='w', padx=25, pady=(40, 40))
 
-        def add_nav_btn(text, cmd, style="TButton"):
-            ttk.Button(sidebar, text=text, command=cmd, style=style, cursor="hand2").pack(fill=tk.X, padx=20, pady=6)
-
-        add_nav_btn("Tambah File", self.add_files, "Primary.TButton")
-        ttk.Separator(sidebar, orient='horizontal').pack(fill=tk.X, padx=20, pady=15)
-        add_nav_btn("Proses & Gabung", self.process_files, "TButton")
-        add_nav_btn("Batch Folder", self.batch_process, "TButton")
-        add_nav_btn("Kosongkan Semua", self.clear_all_files, "TButton")
-        
-        tk.Label(sidebar, bg=COLOR_FG).pack(expand=True)
-        add_nav_btn("Pengaturan", self.open_settings, "Secondary.TButton")
-        add_nav_btn("Bantuan", self.show_help, "TButton")
-        add_nav_btn("Keluar", self.root.destroy, "TButton")
+        # (text, command, style); command None -> '-' separator, '' flexible spacer
+        nav = (
+            ("Tambah File", self.add_files, "Primary.TButton"),
+            ("-", None, None),
+            ("Proses & Gabung", self.process_files, "TButton"),
+            ("Batch Folder", self.batch_process, "TButton"),
+            ("Kosongkan Semua", self.clear_all_files, "TButton"),
+            ("", None, None),
+            ("Pengaturan", self.open_settings, "Secondary.TButton"),
+            ("Bantuan", self.show_help, "TButton"),
+            ("Keluar", self._on_close, "TButton"),
+        )
+        for txt, cmd, st in nav:
+            if cmd is not None:
+                ttk.Button(sidebar, text=txt, command=cmd, style=st, cursor="hand2").pack(fill=tk.X, padx=20, pady=6)
+            elif txt == "-":
+                ttk.Separator(sidebar, orient='horizontal').pack(fill=tk.X, padx=20, pady=15)
+            else:
+                tk.Label(sidebar, bg=COLOR_FG).pack(expand=True)
 
         # Main Area
         main_area = ttk.Frame(self.root, style="TFrame")
@@ -153,83 +216,189 @@ class GUIApp:
         self.log.pack(fill=tk.BOTH, expand=True)
 
     def _log(self, msg):
-        self.log.configure(state='normal')
-        self.log.insert(tk.END, f"• {msg}\n")
-        self.log.see(tk.END)
-        self.log.configure(state='disabled')
-        self.status_var.set(msg)
+        """Queue a log line. Safe to call from any thread; the UI thread drains it."""
+        self._log_queue.put_nowait((threading.current_thread().name, msg))
+
+    def _drain_log_queue(self):
+        """Flush pending log lines to the Text widget in one insert, then reschedule."""
+        lines = []
+        try:
+            while len(lines) < self.LOG_BATCH:
+                lines.append(self._log_queue.get_nowait())
+        except queue.Empty:
+            pass
+        if lines:
+            self.log.configure(state='normal')
+            main = threading.main_thread().name
+            self.log.insert(tk.END, "".join(f"• {msg}\n" if name == main else f"• [{name}] {msg}\n"
+                                            for name, msg in lines))
+            # Keep only the newest LOG_MAX_LINES so see()/layout cost stays flat
+            total = int(self.log.index('end-1c').split('.')[0])
+            if total > self.LOG_MAX_LINES:
+                self.log.delete('1.0', f'{total - self.LOG_MAX_LINES + 1}.0')
+            self.log.see(tk.END)
+            self.log.configure(state='disabled')
+            self.status_var.set(lines[-1][1])
+        self.root.after(self.LOG_POLL_MS, self._drain_log_queue)
+
+    def _file_info(self, f):
+        """
+        File info for a path, with the treeview row strings formatted once.
+        Reused until the file's (mtime, size) changes.
+        """
+        try:
+            st = os.stat(f)
+            mtime, size = st.st_mtime, st.st_size
+        except OSError:
+            mtime = size = None
+        cached = self._info_cache.get(f)
+        if cached is not None and cached[0] == mtime and cached[1] == size:
+            return cached[2]
+        info = self.file_manager.get_file_info(f)
+        info['_values'] = (info['name'], f"{info['size_mb']} MB", info['category'])
+        self._info_cache[f] = (mtime, size, info)
+        return info
+
+    def _clear_rows(self):
+        if self._iids: self.treeview.delete(*self._iids) # One Tcl call for all rows
+        self._iids = []
+
+    def _append_rows(self, start):
+        """Insert tree rows for self.files[start:], i.e. files appended since the last update."""
+        self._iids.extend(self.treeview.insert('', tk.END, values=(i+1, *self._file_info(f)['_values']))
+                          for i, f in enumerate(self.files[start:], start))
 
     def _refresh_file_tree(self):
-        for item in self.treeview.get_children(): self.treeview.delete(item)
-        for i, f in enumerate(self.files):
-            info = self.file_manager.get_file_info(f)
-            self.treeview.insert('', tk.END, values=(i+1, info['name'], f"{info['size_mb']} MB", info['category']))
+        self._clear_rows()
+        self._append_rows(0)
+
+    def _schedule_refresh(self):
+        """Coalesce full rebuilds: any number of calls before the next idle -> one refresh."""
+        if self._refresh_pending: return
+        self._refresh_pending = True
+        self.root.after_idle(self._do_refresh)
+
+    def _do_refresh(self):
+        self._refresh_pending = False
+        self._refresh_file_tree()
+        if self._pending_select:
+            self._select_rows(self._pending_select)
+            self._pending_select = None
+
+    def _select_rows(self, rows):
+        """Select rows by index (row-aligned iids, no tree traversal); waits for a pending refresh."""
+        if self._refresh_pending:
+            self._pending_select = rows
+        else:
+            self.treeview.selection_set(*[self._iids[r] for r in rows])
 
     # --- NEW LIST MANAGEMENT FUNCTIONS ---
     def add_files(self):
-        paths = filedialog.askopenfilenames()
+        paths = filedialog.askopenfilenames(initialdir=self._last_dir or os.path.expanduser('~'))
         if not paths: return
-        count = 0
+        last_dir = os.path.dirname(paths[0])
+        if last_dir != self._last_dir:
+            self._last_dir = last_dir
+            self._last_dir_changed = True
+            self.settings_mgr.set_setting('ui_last_open_dir', last_dir)
+        self._add_paths(paths)
+
+    def _add_paths(self, paths):
+        """Append paths to the list, validating those not already in it on the worker pool."""
+        # Paths already in the list were validated when first added
+        todo = [p for p in paths if p not in self._files_set]
+        if not todo:
+            self._add_validated(paths, {})
+            return
+        self.status_var.set(f"Memeriksa {len(todo)} file...")
+        self._submit(self._validate_paths, paths, todo)
+
+    def _validate_paths(self, paths, todo):
+        """Worker: validate new files in parallel, then hand the results to the UI thread."""
+        with ThreadPoolExecutor(max_workers=min(32, len(todo))) as executor:
+            results = dict(zip(todo, executor.map(self.file_manager.validate_file, todo)))
+        self.root.after(0, self._add_validated, paths, results)
+
+    def _add_validated(self, paths, results):
+        start = len(self.files)
         for p in paths:
-            is_valid, err = self.file_manager.validate_file(p)
+            is_valid, err = results.get(p, (True, None))
             if is_valid:
                 # FIXED: Duplicates now allowed for creative layouts
                 self.files.append(p)
-                count += 1
-            elif not is_valid: self._log(f"Skip: {os.path.basename(p)} ({err})")
+            else: self._log(f"Skip: {os.path.basename(p)} ({err})")
+        self._files_set.update(self.files[start:])
+        count = len(self.files) - start
         if count > 0:
-            self._refresh_file_tree()
+            self._append_rows(start)
             self._log(f"Ditambahkan {count} file.")
 
+    def _rows_of(self, iids):
+        """Row indices of tree items, via the tracked iids (no Tcl round-trip per item)."""
+        row_of = {iid: i for i, iid in enumerate(self._iids)}
+        return [row_of[iid] for iid in iids]
+
     def remove_selected(self):
         selected = self.treeview.selection()
         if not selected: return
         
         # Remove in reverse index order to maintain integrity
-        indices = sorted([self.treeview.index(item) for item in selected], reverse=True)
+        indices = sorted(self._rows_of(selected), reverse=True)
+        removed = set()
         for i in indices:
-            if 0 <= i < len(self.files):
-                del self.files[i]
-        
-        self._refresh_file_tree()
+            del self._iids[i]
+            removed.add(self.files.pop(i))
+        gone = removed.difference(self.files)
+        self._files_set.difference_update(gone)
+        for f in gone:
+            self._info_cache.pop(f, None)
+        
+        # Drop only the selected rows, then renumber the rows below them
+        self.treeview.delete(*selected)
+        for i in range(indices[-1], len(self._iids)):
+            self.treeview.set(self._iids[i], 'idx', i+1)
         self._log(f"Dihapus {len(indices)} file.")
 
     def move_up(self):
+        if not self.files: return
         selected = self.treeview.selection()
         if not selected: return
         
-        rows = [self.treeview.index(item) for item in selected]
+        rows = self._rows_of(selected)
         if any(r == 0 for r in rows): return # Can't move up if at top
         
+        moved = False
         for r in sorted(rows):
-            self.files[r], self.files[r-1] = self.files[r-1], self.files[r]
+            if self.files[r] != self.files[r-1]: # Identical duplicates: nothing to swap
+                self.files[r], self.files[r-1] = self.files[r-1], self.files[r]
+                moved = True
             
-        self._refresh_file_tree()
-        # Reselect
-        for r in rows:
-            child = self.treeview.get_children()[r-1]
-            self.treeview.selection_add(child)
+        if moved: self._schedule_refresh()
+        self._select_rows([r-1 for r in rows])
 
     def move_down(self):
+        if not self.files: return
         selected = self.treeview.selection()
         if not selected: return
         
-        rows = [self.treeview.index(item) for item in selected]
+        rows = self._rows_of(selected)
         if any(r == len(self.files)-1 for r in rows): return # Can't move down if at bottom
         
+        moved = False
         for r in sorted(rows, reverse=True):
-            self.files[r], self.files[r+1] = self.files[r+1], self.files[r]
+            if self.files[r] != self.files[r+1]:
+                self.files[r], self.files[r+1] = self.files[r+1], self.files[r]
+                moved = True
             
-        self._refresh_file_tree()
-        # Reselect
-        for r in rows:
-            child = self.treeview.get_children()[r+1]
-            self.treeview.selection_add(child)
+        if moved: self._schedule_refresh()
+        self._select_rows([r+1 for r in rows])
 
     def clear_all_files(self):
         if self.files and messagebox.askyesno("Konfirmasi", "Kosongkan seluruh daftar file?"):
             self.files.clear()
-            self._refresh_file_tree()
+            self._files_set.clear()
+            self._info_cache.clear()
+            self._clear_rows()
             self._log("Daftar dibersihkan.")
 
     # --- PROCESSING LOGIC (UNCHANGED) ---
@@ -238,70 +407,103 @@ class GUIApp:
             messagebox.showwarning("Info", "Pilih file terlebih dahulu.")
             return
             
-        valid, category = self.file_manager.check_file_types_consistency(self.files)
-        self.settings_mgr.apply_to_config()
+        valid, category = self._cached_consistency()
+        if self.settings_mgr.settings_dirty():
+            self.settings_mgr.apply_to_config()
         
         choice = self._ask_merge_or_collect(category)
         if choice == 'collect':
             self._collect_files()
         elif choice == 'merge':
-            if category == 'image': self.show_image_options()
-            elif category == 'text': self.show_text_options()
-            elif category in ('mixed', 'document'): self.show_universal_options()
+            handler = self._merge_handlers.get(category)
+            if handler: handler()
             else: messagebox.showwarning("Info", f"Tipe '{category}' tidak mendukung penggabungan.")
 
-    def _ask_merge_or_collect(self, category) -> str:
+    # --- OPTION DIALOGS (built once, then hidden/shown) ---
+    # name -> (title, geometry, builder method name)
+    _DIALOGS = {
+        'merge': ("Pilih Aksi", "450x200", '_build_merge_dialog'),
+        'universal': ("Universal PDF Merge", None, '_build_universal_dialog'),
+        'image': ("Image Merge Options", "400x350", '_build_image_dialog'),
+        'text': ("Text Merge Options", "400x250", '_build_text_dialog'),
+    }
+
+    def _dialog(self, name):
+        """Return the cached Toplevel for `name`, building it on first use."""
+        win = self._dialogs.get(name)
+        if win is not None and win.winfo_exists():
+            return win
+        title, geometry, builder = self._DIALOGS[name]
         win = Toplevel(self.root)
-        win.title("Pilih Aksi")
-        win.geometry("450x200")
+        win.withdraw()
+        win.title(title)
+        if geometry: win.geometry(geometry)
         win.config(bg=COLOR_BG)
         win.transient(self.root)
-        win.grab_set()
+        win.protocol("WM_DELETE_WINDOW", lambda: self._hide_dialog(win))
+        getattr(self, builder)(win)
+        self._dialogs[name] = win
+        return win
+
+    def _show_dialog(self, win, grab=False):
+        win.deiconify()
+        win.lift()
+        if grab: win.grab_set()
+
+    def _hide_dialog(self, win):
+        win.grab_release()
+        win.withdraw()
+        if win is self._dialogs.get('merge'):
+            self._merge_var.set('')  # Closing = cancel, unblocks wait_variable
+
+    def _build_merge_dialog(self, win):
+        self._merge_var = StringVar(value='')
+        self._merge_msg = tk.Label(win, font=("Helvetica", 11), bg=COLOR_BG)
+        self._merge_msg.pack(pady=20)
         
-        msg = "Mode Universal PDF Merge tersedia." if category == 'mixed' else f"Terdeteksi: {category.upper()}"
-        tk.Label(win, text=msg, font=("Helvetica", 11), bg=COLOR_BG).pack(pady=20)
-        
-        choice = {'val': 'merge'}
         f = tk.Frame(win, bg=COLOR_BG)
         f.pack(pady=10)
-        
-        def set_mode(m):
-            choice['val'] = m
-            win.destroy()
+        ttk.Button(f, text="GABUNG (Merge)", style="Primary.TButton", command=lambda: self._merge_var.set('merge')).pack(side=tk.LEFT, padx=10)
+        ttk.Button(f, text="KUMPULKAN (Collect)", style="Secondary.TButton", command=lambda: self._merge_var.set('collect')).pack(side=tk.LEFT, padx=10)
+
+    def _cached_consistency(self):
+        """check_file_types_consistency() using the categories already in the info cache."""
+        try:
+            cats = {self._info_cache[f][2]['category'] for f in self.files}
+        except KeyError: # Cache cold for some file
+            return self.file_manager.check_file_types_consistency(self.files)
+        return True, (cats.pop() if len(cats) == 1 else 'mixed')
 
-        ttk.Button(f, text="GABUNG (Merge)", style="Primary.TButton", command=lambda: set_mode('merge')).pack(side=tk.LEFT, padx=10)
-        ttk.Button(f, text="KUMPULKAN (Collect)", style="Secondary.TButton", command=lambda: set_mode('collect')).pack(side=tk.LEFT, padx=10)
+    def _ask_merge_or_collect(self, category) -> str:
+        win = self._dialog('merge')
+        msg = "Mode Universal PDF Merge tersedia." if category == 'mixed' else f"Terdeteksi: {category.upper()}"
+        self._merge_msg.config(text=msg)
+        self._merge_var.set('')
         
-        self.root.wait_window(win)
-        return choice['val']
+        self._show_dialog(win, grab=True)
+        self.root.wait_variable(self._merge_var)
+        choice = self._merge_var.get()
+        win.grab_release()
+        win.withdraw()
+        return choice
 
-    def show_universal_options(self):
-        win = Toplevel(self.root)
-        win.title("Universal PDF Merge")
-        win.config(bg=COLOR_BG)
+    def _build_universal_dialog(self, win):
         tk.Label(win, text="Gabung Semua ke PDF", font=("Helvetica", 12, "bold"), bg=COLOR_BG).pack(pady=15)
         
         def run():
-            win.destroy()
+            self._hide_dialog(win)
             out_path = str(get_output_path("merged_universal.pdf"))
-            self._run_bg(lambda: self.universal_processor.merge_all_to_pdf(self.files, out_path), "Universal Merge")
+            files = tuple(self.files) # Snapshot: the list may change while the job runs
+            self._run_bg(lambda cb: self.universal_processor.merge_all_to_pdf(files, out_path, progress_cb=cb), "Universal Merge")
         ttk.Button(win, text="MULAI", style="Primary.TButton", command=run).pack(pady=20)
 
-    # UPDATED: show_image_options to respect settings defaults
-    def show_image_options(self):
-        win = Toplevel(self.root)
-        win.title("Image Merge Options")
-        win.geometry("400x350")
-        win.config(bg=COLOR_BG)
-        
-        # Pull defaults from currently loaded settings
-        s = self.settings_mgr.settings
-        
-        # Variables
-        v_layout = StringVar(value=s.image_default_layout)
-        v_spacing = StringVar(value=str(s.image_default_spacing))
-        v_resize = StringVar(value=s.image_default_resize_mode)
-        v_filter = StringVar(value=s.image_default_filter)
+    def show_universal_options(self):
+        self._show_dialog(self._dialog('universal'))
+
+    def _build_image_dialog(self, win):
+        # Variables (re-seeded from settings on every show)
+        v_layout, v_spacing, v_resize, v_filter = StringVar(), StringVar(), StringVar(), StringVar()
+        self._image_vars = (v_layout, v_spacing, v_resize, v_filter)
         
         # UI Helper
         def row(lbl, var, opts):
@@ -315,10 +517,10 @@ class GUIApp:
 
         tk.Label(win, text="KONFIGURASI IMAGE MERGE", font=("Helvetica", 11, "bold"), bg=COLOR_BG).pack(pady=15)
         
-        row("Layout:", v_layout, ['vertical', 'horizontal', 'grid'])
+        row("Layout:", v_layout, _LAYOUT_OPTS)
         row("Spacing (px):", v_spacing, None)
-        row("Resize Mode:", v_resize, ['none', 'fit', 'fill', 'stretch'])
-        row("Filter:", v_filter, ['none', 'grayscale', 'sepia', 'blur', 'sharpen'])
+        row("Resize Mode:", v_resize, _RESIZE_OPTS)
+        row("Filter:", v_filter, _FILTER_OPTS)
         
         def on_run():
             try:
@@ -328,77 +530,186 @@ class GUIApp:
                 resize = v_resize.get()
                 filt = v_filter.get()
                 
-                win.destroy()
+                self._hide_dialog(win)
                 
                 # Execute with selected values
                 out_path = str(get_output_path("merged_image.png"))
-                self._run_bg(lambda: self.image_processor.process_and_merge(
-                    self.files, out_path,
-                    layout=layout, spacing=spacing, resize_mode=resize, filter_name=filt
+                workers = self.settings_mgr.settings.performance_max_workers
+                files = tuple(self.files)
+                self._run_bg(lambda cb: self.image_processor.process_and_merge_parallel(
+                    files, out_path,
+                    layout=layout, spacing=spacing, resize_mode=resize, filter_name=filt,
+                    max_workers=workers, progress_cb=cb
                 ), "Merging Images")
                 
             except ValueError:
-                messagebox.showerror("Error", "Spacing harus berupa angka")
+                messagebox.showerror("Error", "Spacing harus berupa angka", parent=win)
 
         ttk.Button(win, text="MULAI PROSES", style="Primary.TButton", command=on_run).pack(side=tk.BOTTOM, pady=20)
 
-    # UPDATED: show_text_options to respect settings defaults
-    def show_text_options(self):
-        win = Toplevel(self.root)
-        win.title("Text Merge Options")
-        win.geometry("400x250")
-        win.config(bg=COLOR_BG)
+    # UPDATED: show_image_options to respect settings defaults
+    def show_image_options(self):
+        win = self._dialog('image')
         
+        # Pull defaults from currently loaded settings
         s = self.settings_mgr.settings
-        v_sep = StringVar(value=s.text_default_separator)
+        v_layout, v_spacing, v_resize, v_filter = self._image_vars
+        v_layout.set(s.image_default_layout)
+        v_spacing.set(str(s.image_default_spacing))
+        v_resize.set(s.image_default_resize_mode)
+        v_filter.set(s.image_default_filter)
+        
+        self._show_dialog(win)
+
+    def _build_text_dialog(self, win):
+        self._text_sep_var = v_sep = StringVar()
         
         tk.Label(win, text="KONFIGURASI TEXT MERGE", font=("Helvetica", 11, "bold"), bg=COLOR_BG).pack(pady=15)
         
         f = tk.Frame(win, bg=COLOR_BG)
         f.pack(fill=tk.X, padx=20, pady=5)
         tk.Label(f, text="Separator:", width=15, anchor='w', bg=COLOR_BG).pack(side=tk.LEFT)
-        ttk.Combobox(f, textvariable=v_sep, values=['simple', 'fancy', 'minimal', 'none'], state="readonly").pack(side=tk.LEFT, fill=tk.X, expand=True)
+        ttk.Combobox(f, textvariable=v_sep, values=_SEP_OPTS, state="readonly").pack(side=tk.LEFT, fill=tk.X, expand=True)
         
         def on_run():
             sep = v_sep.get()
-            win.destroy()
+            self._hide_dialog(win)
             
             out_path = str(get_output_path("merged_text.txt"))
-            self._run_bg(lambda: self.text_processor.merge_text_files(
-                self.files, out_path, separator_style=sep
+            files = tuple(self.files)
+            self._run_bg(lambda cb: self.text_processor.merge_text_files(
+                files, out_path, separator_style=sep, progress_cb=cb
             ), "Merging Text")
             
         ttk.Button(win, text="MULAI PROSES", style="Primary.TButton", command=on_run).pack(side=tk.BOTTOM, pady=20)
 
+    # UPDATED: show_text_options to respect settings defaults
+    def show_text_options(self):
+        win = self._dialog('text')
+        self._text_sep_var.set(self.settings_mgr.settings.text_default_separator)
+        self._show_dialog(win)
+
     def _collect_files(self):
         dest = filedialog.askdirectory()
         if dest:
-            self._run_bg(lambda: self.file_manager.copy_files_to_folder(self.files, dest), "Collecting")
+            files = tuple(self.files)
+            self._run_bg(lambda cb: self.file_manager.copy_files_to_folder(files, dest, progress_cb=cb), "Collecting")
 
     def _run_bg(self, func, desc):
+        """
+        Run func in a worker thread. If func takes a parameter it receives a
+        progress callback that queues intermediate log messages and aborts
+        the job once the app is closing.
+        The final result is expected to be an (ok, msg) tuple.
+        """
         self._log(f"⏳ {desc}...")
         self.notebook.select(1)
+        def progress_cb(msg):
+            if self._closing: raise RuntimeError(f"{desc} dibatalkan")
+            self._log(msg)
+        try:
+            wants_progress = len(inspect.signature(func).parameters) > 0
+        except (TypeError, ValueError):
+            wants_progress = False
         def task():
             try:
-                res = func()
-                if isinstance(res, tuple):
+                res = func(progress_cb) if wants_progress else func()
+                if isinstance(res, tuple) and len(res) == 2:
                     ok, msg = res
-                    self.root.after(0, lambda: self._log(f"{'✅' if ok else '❌'} {msg}"))
-                    if ok: self.root.after(0, lambda: self._ask_open(str(OUTPUT_DIR)))
+                    self._log(f"{'✅' if ok else '❌'} {msg or desc}")
+                    if ok and self._ui_call(messagebox.askyesno, "Selesai", "Buka folder output?"):
+                        self._open_folder(str(OUTPUT_DIR))
+                else:
+                    self._log(f"⚠ {desc}: hasil tidak dikenali ({res!r})")
             except Exception as e:
-                self.root.after(0, lambda: self._log(f"❌ Error: {e}"))
-        threading.Thread(target=task, daemon=True).start()
-
-    def _ask_open(self, path):
-        if messagebox.askyesno("Selesai", "Buka folder output?"):
+                self._log(f"❌ Error: {e}")
+        self._submit(task)
+
+    def _submit(self, fn, *args):
+        """Run fn(*args) on the shared worker pool; unexpected errors go to the log."""
+        future = self._pool.submit(fn, *args)
+        self._futures.add(future)
+        future.add_done_callback(self._on_job_done)
+        return future
+
+    def _on_job_done(self, future):
+        self._futures.discard(future)
+        if not future.cancelled() and future.exception() is not None:
+            self._log(f"❌ Error: {future.exception()}")
+
+    def _ui_call(self, fn, *args, **kwargs):
+        """
+        From a worker thread: run fn on the UI thread and wait for its result.
+        Tk dialogs must never be opened from a worker. Returns None if the app closes first.
+        """
+        result = queue.SimpleQueue()
+        def call():
+            try: result.put((True, fn(*args, **kwargs)))
+            except Exception as e: result.put((False, e))
+        self.root.after(0, call)
+        while True:
             try:
-                if sys.platform=='win32': os.startfile(path)
-                else: subprocess.Popen(['xdg-open', path])
-            except: pass
+                ok, value = result.get(timeout=0.2)
+            except queue.Empty:
+                if self._closing: return None
+                continue
+            if ok: return value
+            raise value
+
+    def _on_close(self):
+        self._closing = True
+        # Drop queued jobs (shutdown(cancel_futures=True) needs Python 3.9)
+        for future in list(self._futures):
+            future.cancel()
+        self._pool.shutdown(wait=False)
+        if self._last_dir_changed:
+            self.settings_mgr.save_settings()
+        self.root.destroy()
+
+    @staticmethod
+    def _open_folder(path):
+        try:
+            if sys.platform=='win32': os.startfile(path)
+            else: subprocess.Popen(['xdg-open', path])
+        except: pass
+
+    def batch_process(self):
+        path = filedialog.askdirectory(title="Pilih Folder Batch")
+        if not path: return
+        is_image = messagebox.askyesnocancel("Batch Folder", "Ambil file GAMBAR dari folder ini?\n(Ya = Gambar, Tidak = Teks)")
+        if is_image is None: return
+        exts = _IMAGE_EXTS if is_image else _TEXT_EXTS
+        self.status_var.set("Memindai folder...")
+        self._submit(self._scan_folder, path, exts)
+
+    def _scan_folder(self, path, exts):
+        """Worker: list files directly inside `path` whose extension is in `exts`."""
+        files_found = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    name = entry.name
+                    dot = name.rfind('.')
+                    # dot > 0: like splitext, '.png' is a hidden file without extension
+                    if dot > 0 and name[dot:].lower() in exts and entry.is_file(follow_symlinks=False):
+                        files_found.append(entry.path)
+            files_found.sort()
+        except OSError as e:
+            self._log(f"❌ Error: {e}")
+            return
+        self.root.after(0, self._load_batch, files_found)
+
+    def _load_batch(self, files_found):
+        if not files_found:
+            self._log("Tidak ada file yang cocok di folder ini.")
+            return
+        self._add_paths(files_found)
+        self.notebook.select(0)
 
-    def batch_process(self): messagebox.showinfo("Info", "Fitur Batch belum diimplementasi di UI ini.")
-    def open_settings(self): SettingsWindow(self.root, self.settings_mgr)
-    def show_help(self): messagebox.showinfo("Bantuan", "Gunakan panel samping untuk navigasi.")
+    def open_settings(self):
+        from ui.gui_settings import SettingsWindow
+        SettingsWindow.open(self.root, self.settings_mgr)
+    def show_help(self): messagebox.showinfo("Bantuan", _HELP_MESSAGE)
     def run(self): self.root.mainloop()
 
 if __name__ == '__main__':
@@ -3,21 +3,94 @@ Settings GUI Module - Bauhaus Edition v2.3
 Includes PDF/Universal Configuration Tab.
 """
 
+import os
+import dataclasses
+import typing
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog, StringVar, BooleanVar, IntVar
 from core.settings_manager import SettingsManager, UserSettings
 from config import ImageConfig, TextConfig, PdfConfig
+from ui.theme import COLOR_BG, COLOR_FG, COLOR_ACCENT_2, COLOR_PANEL # Shared Bauhaus palette
 
-COLOR_BG = "#F2F2F2"
-COLOR_FG = "#1A1A1A"
-COLOR_ACCENT_2 = "#1F3A93"
-COLOR_PANEL = "#FFFFFF"
+# Combobox choices (fixed at runtime)
+_LAYOUT_VALUES = (ImageConfig.LAYOUT_VERTICAL, ImageConfig.LAYOUT_HORIZONTAL, ImageConfig.LAYOUT_GRID)
+_RESIZE_MODE_VALUES = tuple(ImageConfig.RESIZE_MODES)
+_FILTER_VALUES = tuple(ImageConfig.FILTERS)
+_SEPARATOR_VALUES = tuple(TextConfig.SEPARATOR_STYLES)
+_ENCODING_VALUES = ('utf-8', 'latin-1', 'cp1252', 'ascii')
+_PAGE_SIZE_VALUES = tuple(PdfConfig.PAGE_SIZES)
+_PDF_FONT_VALUES = ('Helvetica', 'Times-Roman', 'Courier')
+
+# Tab layouts: (section title, ((kind, label, key, extra helper args), ...))
+_IMAGE_TAB = (
+    ("Tata Letak & Ukuran", (
+        ('combo', "Default Layout:", 'image_default_layout', (_LAYOUT_VALUES,)),
+        ('spin', "Spacing (px):", 'image_default_spacing', (0, 500)),
+        ('combo', "Resize Mode:", 'image_default_resize_mode', (_RESIZE_MODE_VALUES,)),
+    )),
+    ("Efek & Watermark", (
+        ('combo', "Default Filter:", 'image_default_filter', (_FILTER_VALUES,)),
+        ('check', "Aktifkan Watermark Otomatis", 'image_add_watermark', ()),
+        ('entry', "Teks Watermark:", 'image_watermark_text', ()),
+    )),
+)
+_TEXT_TAB = (
+    ("Format Dokumen", (
+        ('combo', "Separator Style:", 'text_default_separator', (_SEPARATOR_VALUES,)),
+        ('check', "Nomor Baris (Line Numbers)", 'text_add_line_numbers', ()),
+        ('check', "Export ke Markdown (.md)", 'text_markdown_export', ()),
+    )),
+    ("Encoding", (
+        ('combo', "Default Encoding:", 'text_default_encoding', (_ENCODING_VALUES,)),
+    )),
+)
+_PDF_TAB = (
+    ("Universal PDF Settings", (
+        ('combo', "Ukuran Halaman:", 'pdf_page_size', (_PAGE_SIZE_VALUES,)),
+        ('combo', "Jenis Font:", 'pdf_font', (_PDF_FONT_VALUES,)),
+        ('spin', "Ukuran Font (pt):", 'pdf_font_size', (6, 24)),
+        ('check', "Tampilkan Nomor Halaman", 'pdf_show_page_numbers', ()),
+    )),
+)
+_OUTPUT_TAB = (
+    ("Penyimpanan", (
+        ('dir', "Output Folder:", 'output_default_directory', ()),
+        ('check', "Timestamp di Nama File", 'output_use_timestamp', ()),
+        ('check', "Backup File Lama (Safe Mode)", 'output_create_backup', ()),
+    )),
+)
+
+# UserSettings field -> Tk variable class, resolved once at import.
+# get_type_hints() also resolves string annotations, which raw __annotations__ would not.
+_SETTING_TYPES = typing.get_type_hints(UserSettings)
+_VAR_FACTORY_BY_FIELD = {
+    f.name: {bool: BooleanVar, int: IntVar}.get(_SETTING_TYPES[f.name], StringVar)
+    for f in dataclasses.fields(UserSettings)
+}
+
+def _ensure_styles(root):
+    """
+    Configure this window's ttk styles once per Tk root (styles are interpreter-wide).
+    Button/Card styles come from the main window's theme.
+    """
+    if getattr(root, '_settings_styles_ready', False):
+        return
+    style = ttk.Style(root)
+    style.configure("TNotebook", background=COLOR_BG)
+    style.configure("TNotebook.Tab", font=("Helvetica", 10), padding=[10, 5])
+    style.configure("Section.TLabel", background=COLOR_BG, foreground=COLOR_ACCENT_2,
+                    font=("Helvetica", 11, "bold"), padding=(0, 10))
+    # Setting rows on white cards
+    style.configure("Row.TLabel", background=COLOR_PANEL)
+    style.configure("Row.TCheckbutton", background=COLOR_PANEL)
+    root._settings_styles_ready = True
 
 class SettingsWindow(tk.Toplevel):
     def __init__(self, parent, manager: SettingsManager):
         super().__init__(parent)
         self.manager = manager
-        self.original_settings = self.manager.load_settings()
+        # In-memory settings are authoritative (kept in sync with settings.json on save)
+        self.original_settings = dataclasses.replace(self.manager.settings)
         
         self.title("Pengaturan")
         self.geometry("750x650")
@@ -26,23 +99,40 @@ class SettingsWindow(tk.Toplevel):
         self.grab_set()
         
         self.vars = {}
+        self._last_dir = None # Last folder picked via _select_dir
         self._create_variables()
         self._load_settings_to_vars()
+        _ensure_styles(self._root())
         self._build_ui()
+        self.protocol("WM_DELETE_WINDOW", self._on_cancel)
+
+    @classmethod
+    def open(cls, parent, manager: SettingsManager):
+        """Show the settings window, reusing the (hidden) instance kept on parent."""
+        existing = getattr(parent, '_settings_window', None)
+        if existing is not None and existing.winfo_exists():
+            existing.original_settings = dataclasses.replace(manager.settings)
+            existing._load_settings_to_vars()
+            existing.deiconify()
+            existing.lift()
+            existing.grab_set()
+            return existing
+        inst = cls(parent, manager)
+        parent._settings_window = inst
+        return inst
+
+    def _on_cancel(self):
+        self.grab_release()
+        self.withdraw()
 
     def _create_variables(self):
-        for key, value in self.original_settings.__dict__.items():
-            if isinstance(value, bool):
-                self.vars[key] = BooleanVar()
-            elif isinstance(value, int):
-                self.vars[key] = IntVar()
-            else:
-                self.vars[key] = StringVar()
+        self.vars = {key: var_cls() for key, var_cls in _VAR_FACTORY_BY_FIELD.items()}
 
     def _load_settings_to_vars(self):
+        values = self.original_settings.__dict__
         for key, var in self.vars.items():
-            if hasattr(self.original_settings, key):
-                var.set(getattr(self.original_settings, key))
+            if key in values:
+                var.set(values[key])
 
     def _build_ui(self):
         header = tk.Frame(self, bg=COLOR_BG)
@@ -50,17 +140,17 @@ class SettingsWindow(tk.Toplevel):
         tk.Label(header, text="KONFIGURASI", font=("Helvetica", 16, "bold"), 
                  bg=COLOR_BG, fg=COLOR_FG).pack(side=tk.LEFT)
 
-        style = ttk.Style()
-        style.configure("TNotebook", background=COLOR_BG)
-        style.configure("TNotebook.Tab", font=("Helvetica", 10), padding=[10, 5])
-        
         notebook = ttk.Notebook(self)
         notebook.pack(fill=tk.BOTH, expand=True, padx=20, pady=5)
 
+        # Tabs are empty placeholders; content is built the first time a tab is shown
+        self._tab_builders = {}
         self._build_tab(notebook, "  GAMBAR  ", self._build_image_tab)
         self._build_tab(notebook, "  TEKS  ", self._build_text_tab)
         self._build_tab(notebook, "  PDF / UNIVERSAL  ", self._build_pdf_tab) # NEW
         self._build_tab(notebook, "  OUTPUT  ", self._build_output_tab)
+        notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self._build_pending_tab(notebook.select())
 
         footer = tk.Frame(self, bg=COLOR_BG, pady=20)
         footer.pack(fill=tk.X, padx=20)
@@ -70,116 +160,130 @@ class SettingsWindow(tk.Toplevel):
 
         btn("SIMPAN & TUTUP", self._on_save, "Primary.TButton")
         btn("Terapkan", self._on_apply, "Secondary.TButton")
-        btn("Batal", self.destroy)
+        btn("Batal", self._on_cancel)
         
         ttk.Button(footer, text="Reset Default", style="TButton", 
                    command=self._on_reset).pack(side=tk.LEFT)
+        # Inline confirmation for Apply (errors still use a messagebox)
+        self._status = tk.Label(footer, text="", fg=COLOR_ACCENT_2, bg=COLOR_BG, font=("Helvetica", 10, "bold"))
+        self._status.pack(side=tk.LEFT, padx=15)
+        self._status_job = None
 
     def _build_tab(self, notebook, title, content_func):
         frame = ttk.Frame(notebook, style="TFrame", padding=15)
         notebook.add(frame, text=title)
-        content_func(frame)
+        self._tab_builders[str(frame)] = (frame, content_func)
+
+    def _on_tab_changed(self, event):
+        self._build_pending_tab(event.widget.select())
+
+    def _build_pending_tab(self, tab_id):
+        pending = self._tab_builders.pop(str(tab_id), None)
+        if pending:
+            frame, content_func = pending
+            content_func(frame)
 
     def _section(self, parent, title):
-        lbl = tk.Label(parent, text=title, font=("Helvetica", 11, "bold"), 
-                       bg=COLOR_BG, fg=COLOR_ACCENT_2, pady=10)
-        lbl.pack(anchor="w")
-        return ttk.Frame(parent, style="Card.TFrame", padding=10)
+        ttk.Label(parent, text=title, style="Section.TLabel").pack(anchor="w")
+        # Rows are gridded straight into the card: label | input
+        frame = ttk.Frame(parent, style="Card.TFrame", padding=10)
+        frame.columnconfigure(1, weight=1)
+        frame._row = 0
+        return frame
 
     def _build_image_tab(self, parent):
-        p = self._section(parent, "Tata Letak & Ukuran")
-        p.pack(fill=tk.X)
-        self._combo(p, "Default Layout:", 'image_default_layout', ['vertical', 'horizontal', 'grid'])
-        self._spin(p, "Spacing (px):", 'image_default_spacing', 0, 500)
-        self._combo(p, "Resize Mode:", 'image_default_resize_mode', list(ImageConfig.RESIZE_MODES.keys()))
-
-        p = self._section(parent, "Efek & Watermark")
-        p.pack(fill=tk.X, pady=10)
-        self._combo(p, "Default Filter:", 'image_default_filter', list(ImageConfig.FILTERS.keys()))
-        self._check(p, "Aktifkan Watermark Otomatis", 'image_add_watermark')
-        self._entry(p, "Teks Watermark:", 'image_watermark_text')
+        self._build_sections(parent, _IMAGE_TAB)
 
     def _build_text_tab(self, parent):
-        p = self._section(parent, "Format Dokumen")
-        p.pack(fill=tk.X)
-        self._combo(p, "Separator Style:", 'text_default_separator', list(TextConfig.SEPARATOR_STYLES.keys()))
-        self._check(p, "Nomor Baris (Line Numbers)", 'text_add_line_numbers')
-        self._check(p, "Export ke Markdown (.md)", 'text_markdown_export')
-        
-        p = self._section(parent, "Encoding")
-        p.pack(fill=tk.X, pady=10)
-        self._combo(p, "Default Encoding:", 'text_default_encoding', ['utf-8', 'latin-1', 'cp1252', 'ascii'])
+        self._build_sections(parent, _TEXT_TAB)
 
     def _build_pdf_tab(self, parent): # NEW TAB
-        p = self._section(parent, "Universal PDF Settings")
-        p.pack(fill=tk.X)
-        
-        self._combo(p, "Ukuran Halaman:", 'pdf_page_size', list(PdfConfig.PAGE_SIZES.keys()))
-        self._combo(p, "Jenis Font:", 'pdf_font', ['Helvetica', 'Times-Roman', 'Courier'])
-        self._spin(p, "Ukuran Font (pt):", 'pdf_font_size', 6, 24)
-        self._check(p, "Tampilkan Nomor Halaman", 'pdf_show_page_numbers')
+        self._build_sections(parent, _PDF_TAB)
 
     def _build_output_tab(self, parent):
-        p = self._section(parent, "Penyimpanan")
-        p.pack(fill=tk.X)
-        
-        f = tk.Frame(p, bg=COLOR_PANEL)
-        f.pack(fill=tk.X, pady=5)
-        tk.Label(f, text="Output Folder:", bg=COLOR_PANEL).pack(anchor="w")
-        e = ttk.Entry(f, textvariable=self.vars['output_default_directory'])
-        e.pack(side=tk.LEFT, fill=tk.X, expand=True, pady=2)
-        ttk.Button(f, text="...", width=3, command=self._select_dir).pack(side=tk.LEFT, padx=5)
+        self._build_sections(parent, _OUTPUT_TAB)
+
+    def _build_sections(self, parent, sections):
+        # One pass over the declarative layout; each row kind maps to a helper below
+        for i, (title, rows) in enumerate(sections):
+            p = self._section(parent, title)
+            p.pack(fill=tk.X, pady=10 if i else 0)
+            for kind, label, key, extra in rows:
+                getattr(self, '_' + kind)(p, label, key, *extra)
 
-        self._check(p, "Timestamp di Nama File", 'output_use_timestamp')
-        self._check(p, "Backup File Lama (Safe Mode)", 'output_create_backup')
+    # Helpers (parent is a _section card)
+    @staticmethod
+    def _next_row(parent):
+        r = parent._row
+        parent._row += 1
+        return r
+
+    def _label(self, parent, r, label):
+        ttk.Label(parent, text=label, width=20, anchor="w", style="Row.TLabel").grid(row=r, column=0, sticky="w", pady=2)
 
-    # Helpers
     def _combo(self, parent, label, key, values):
-        f = tk.Frame(parent, bg=COLOR_PANEL)
-        f.pack(fill=tk.X, pady=2)
-        tk.Label(f, text=label, width=20, anchor="w", bg=COLOR_PANEL).pack(side=tk.LEFT)
-        ttk.Combobox(f, textvariable=self.vars[key], values=values, state='readonly').pack(side=tk.LEFT, fill=tk.X, expand=True)
+        r = self._next_row(parent)
+        self._label(parent, r, label)
+        ttk.Combobox(parent, textvariable=self.vars[key], values=values, state='readonly', exportselection=False).grid(row=r, column=1, sticky="ew", pady=2)
 
     def _entry(self, parent, label, key):
-        f = tk.Frame(parent, bg=COLOR_PANEL)
-        f.pack(fill=tk.X, pady=2)
-        tk.Label(f, text=label, width=20, anchor="w", bg=COLOR_PANEL).pack(side=tk.LEFT)
-        ttk.Entry(f, textvariable=self.vars[key]).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        r = self._next_row(parent)
+        self._label(parent, r, label)
+        ttk.Entry(parent, textvariable=self.vars[key], exportselection=False).grid(row=r, column=1, sticky="ew", pady=2)
 
     def _spin(self, parent, label, key, _min, _max):
-        f = tk.Frame(parent, bg=COLOR_PANEL)
-        f.pack(fill=tk.X, pady=2)
-        tk.Label(f, text=label, width=20, anchor="w", bg=COLOR_PANEL).pack(side=tk.LEFT)
-        ttk.Spinbox(f, from_=_min, to=_max, textvariable=self.vars[key]).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        r = self._next_row(parent)
+        self._label(parent, r, label)
+        ttk.Spinbox(parent, from_=_min, to=_max, textvariable=self.vars[key], exportselection=False, validate='none').grid(row=r, column=1, sticky="ew", pady=2)
 
     def _check(self, parent, label, key):
-        f = tk.Frame(parent, bg=COLOR_PANEL)
-        f.pack(fill=tk.X, pady=2)
-        ttk.Checkbutton(f, text=label, variable=self.vars[key]).pack(side=tk.LEFT)
+        r = self._next_row(parent)
+        ttk.Checkbutton(parent, text=label, variable=self.vars[key], style="Row.TCheckbutton").grid(row=r, column=0, columnspan=2, sticky="w", pady=2)
+
+    def _dir(self, parent, label, key):
+        r = self._next_row(parent)
+        self._label(parent, r, label)
+        ttk.Entry(parent, textvariable=self.vars[key], exportselection=False).grid(row=r, column=1, sticky="ew", pady=2)
+        ttk.Button(parent, text="...", width=3, command=self._select_dir).grid(row=r, column=2, padx=5, pady=2)
 
     def _select_dir(self):
-        d = filedialog.askdirectory()
-        if d: self.vars['output_default_directory'].set(d)
+        initial = self._last_dir or self.vars['output_default_directory'].get() or os.path.expanduser('~')
+        d = filedialog.askdirectory(initialdir=initial, parent=self, mustexist=True)
+        if d:
+            self._last_dir = d
+            self.vars['output_default_directory'].set(d)
 
     def _on_save(self):
-        self._on_apply()
-        self.destroy()
+        if self._on_apply():
+            self._on_cancel()
 
-    def _on_apply(self):
+    def _on_apply(self) -> bool:
         try:
-            for k, v in self.vars.items():
-                self.manager.set_setting(k, v.get())
+            self.manager.set_many({k: v.get() for k, v in self.vars.items()})
             if self.manager.save_settings():
                 self.manager.apply_to_config()
-                messagebox.showinfo("Sukses", "Pengaturan disimpan!", parent=self)
-            else:
-                messagebox.showerror("Error", "Gagal menulis file settings.json", parent=self)
+                self._flash_status("✓ Tersimpan")
+                return True
+            messagebox.showerror("Error", "Gagal menulis file settings.json", parent=self)
         except Exception as e:
             messagebox.showerror("Error", str(e), parent=self)
+        return False
+
+    def destroy(self):
+        # Pending after() callbacks would outlive their Tcl command otherwise
+        if getattr(self, '_status_job', None): self.after_cancel(self._status_job)
+        super().destroy()
+
+    def _flash_status(self, text, ms=2000):
+        if self._status_job: self.after_cancel(self._status_job)
+        self._status.config(text=text)
+        def clear():
+            self._status_job = None
+            self._status.config(text="")
+        self._status_job = self.after(ms, clear)
 
     def _on_reset(self):
         if messagebox.askyesno("Reset", "Kembalikan ke pengaturan pabrik?"):
-            self.manager.reset_to_defaults()
-            self.manager.save_settings()
-            self.original_settings = self.manager.load_settings()
+            self.manager.reset_to_defaults() # Also saves
+            self.original_settings = dataclasses.replace(self.manager.settings)
             self._load_settings_to_vars()
\ No newline at end of file
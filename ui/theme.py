@@ -0,0 +1,9 @@
+"""
+Bauhaus color palette shared by the main window and the settings window.
+"""
+
+COLOR_BG = "#F2F2F2"
+COLOR_FG = "#1A1A1A"
+COLOR_ACCENT_1 = "#D22730" 
+COLOR_ACCENT_2 = "#1F3A93"
+COLOR_PANEL = "#FFFFFF"